@@ -13,6 +13,18 @@ Usage
     frame = scan_avro(...).collect()  # or `read_avro(...)`
     write_avro(frame, dest)
 
+Configuration
+-------------
+
+When scanning multiple sources, the next few sources are opened and have their
+headers parsed in background threads. This can be tuned with environment
+variables:
+
+- ``POLARS_FASTAVRO_CONCURRENT_READERS``: the number of threads used to open
+  sources, defaults to the number of cpus.
+- ``POLARS_FASTAVRO_NUM_READERS_PRE_INIT``: how many sources to open ahead of
+  the one being read, defaults to three more than the number of threads.
+
 Limitations
 -----------
 
@@ -1,14 +1,38 @@
-import glob as libglob
-from collections.abc import Iterable, Iterator, Sequence
+import json
+import mmap
+import operator
+import os
+import re
+import stat
+import weakref
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import ExitStack, closing, suppress
 from dataclasses import dataclass, field
+from datetime import datetime
+from fnmatch import fnmatchcase
+from functools import partial
+from io import BufferedReader, BytesIO
+from itertools import chain, islice
+from multiprocessing import get_context
+from operator import attrgetter, itemgetter
 from os import path
 from pathlib import Path
-from typing import BinaryIO, TypeVar
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Any, BinaryIO, TypeVar
 
 import fastavro
 import polars as pl
 from polars.io.plugins import register_io_source
 
+T = TypeVar("T")
 R = TypeVar("R")
 
 
@@ -36,31 +60,55 @@ def resolve_name(namespace: str | None, name: str) -> tuple[str | None, str]:
             raise RuntimeError("unreachable")
 
 
+PRIMITIVE_DTYPES: dict[str, pl.DataType] = {
+    "null": pl.Null(),
+    "boolean": pl.Boolean(),
+    "int": pl.Int32(),
+    "long": pl.Int64(),
+    "float": pl.Float32(),
+    "double": pl.Float64(),
+    "bytes": pl.Binary(),
+    "string": pl.String(),
+}
+
+LOGICAL_DTYPES: dict[tuple[str, str], pl.DataType] = {
+    ("long", "timestamp-millis"): pl.Datetime("ms", "UTC"),
+    ("long", "timestamp-micros"): pl.Datetime("us", "UTC"),
+    ("long", "timestamp-nanos"): pl.Datetime("ns", "UTC"),
+    ("long", "local-timestamp-millis"): pl.Datetime("ms", None),
+    ("long", "local-timestamp-micros"): pl.Datetime("us", None),
+    ("long", "local-timestamp-nanos"): pl.Datetime("ns", None),
+    ("int", "date"): pl.Date(),
+    ("int", "time-millis"): pl.Time(),
+    ("long", "time-micros"): pl.Time(),
+}
+
+
 @dataclass(frozen=True)
 class DataTypeParser:
     parse_logical_types: bool
     names: dict[str, pl.DataType] = field(default_factory=dict)  # pyright: ignore[reportUnknownVariableType]
 
     def parse_dtype(self, namespace: str | None, dtype: object) -> pl.DataType:  # noqa: PLR0911, PLR0912, PLR0915
-        match unwrap_nullable(dtype):
-            case {"type": "long", "logicalType": "timestamp-millis"}:
-                return pl.Datetime("ms", "UTC")
-            case {"type": "long", "logicalType": "timestamp-micros"}:
-                return pl.Datetime("us", "UTC")
-            case {"type": "long", "logicalType": "timestamp-nanos"}:
-                return pl.Datetime("ns", "UTC")
-            case {"type": "long", "logicalType": "local-timestamp-millis"}:
-                return pl.Datetime("ms", None)
-            case {"type": "long", "logicalType": "local-timestamp-micros"}:
-                return pl.Datetime("us", None)
-            case {"type": "long", "logicalType": "local-timestamp-nanos"}:
-                return pl.Datetime("ns", None)
-            case {"type": "int", "logicalType": "date"}:
-                return pl.Date()
-            case {"type": "int", "logicalType": "time-millis"}:
-                return pl.Time()
-            case {"type": "long", "logicalType": "time-micros"}:
-                return pl.Time()
+        unwrapped = unwrap_nullable(dtype)
+        match unwrapped:
+            case str():
+                kind, logical = unwrapped, None
+            case {"type": str() as kind, "logicalType": str() as logical}:
+                pass
+            case {"type": str() as kind}:
+                logical = None
+            case _:  # pragma: no cover
+                raise NotImplementedError(f"unhandled datatype: {unwrapped}")
+
+        # fast path for the simple types that make up most schemas
+        if logical is None:
+            if (resolved := PRIMITIVE_DTYPES.get(kind)) is not None:
+                return resolved
+        elif (resolved := LOGICAL_DTYPES.get((kind, logical))) is not None:
+            return resolved
+
+        match unwrapped:
             case {
                 "type": "bytes" | "fixed",
                 "logicalType": "decimal",
@@ -90,27 +138,14 @@ class DataTypeParser:
                 "logicalType": str(),
             } if not self.parse_logical_types:
                 raise ValueError(f"tried to parse {dtype} without logical-type parsing")
-            case "null" | {"type": "null"}:
-                return pl.Null()
-            case "boolean" | {"type": "boolean"}:
-                return pl.Boolean()
-            case "int" | {"type": "int"}:
-                return pl.Int32()
-            case "long" | {"type": "long"}:
-                return pl.Int64()
-            case "float" | {"type": "float"}:
-                return pl.Float32()
-            case "double" | {"type": "double"}:
-                return pl.Float64()
+            case {"type": str() as physical} if physical in PRIMITIVE_DTYPES:
+                # unparsed logical types fall back to their physical type
+                return PRIMITIVE_DTYPES[physical]
             case {"type": "enum", "name": str() as name, "symbols": [*_] as symbols}:  # pyright: ignore[reportUnknownVariableType]
                 _, fullname = resolve_name(namespace, name)
                 resolved = pl.Enum(symbols)  # pyright: ignore[reportUnknownArgumentType]
                 self.names[fullname] = resolved
                 return resolved
-            case "bytes" | {"type": "bytes"}:
-                return pl.Binary()
-            case "string" | {"type": "string"}:
-                return pl.String()
             case {"type": "array", "items": object() as inner}:
                 return pl.List(self.parse_dtype(namespace, inner))
             case {"type": "fixed", "name": str() as name, "size": int()}:
@@ -134,14 +169,12 @@ class DataTypeParser:
                 resolved = pl.Struct(dict(parsed))
                 self.names[fullname] = resolved
                 return resolved
-            case (str() as reference) | {"type": str() as reference}:
-                resolved = self.names.get(reference)
+            case _:
+                resolved = self.names.get(kind)
                 if resolved is None:
-                    raise ValueError(f"unhandled datatype: {reference!r}")
+                    raise ValueError(f"unhandled datatype: {kind!r}")
                 else:
                     return resolved
-            case unwrapped:  # pragma: no cover
-                raise NotImplementedError(f"unhandled datatype: {unwrapped}")
 
 
 def parse_schema(
@@ -162,10 +195,98 @@ def parse_schema(
             )
 
 
-def open_sources(
+def env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment."""
+    match os.environ.get(name):
+        case None:
+            return default
+        case raw:
+            val = int(raw)
+            if val < 1:
+                raise ValueError(f"{name} must be positive, but got {raw!r}")
+            return val
+
+
+GLOB_MAGIC = re.compile(r"[*?[]")
+
+
+def entry_is_dir(entry: os.DirEntry[str]) -> bool:
+    """Whether a directory entry is a directory, usually without a stat."""
+    try:
+        return entry.is_dir()
+    except OSError:  # pragma: no cover
+        return False
+
+
+def sorted_matches(
+    dirname: str, pattern: str, *, dirs_only: bool = False
+) -> list[os.DirEntry[str]]:
+    """Sorted entries in a directory that match a glob pattern."""
+    # like glob, wildcards don't match hidden files
+    hidden = pattern.startswith(".")
+    try:
+        with os.scandir(dirname or os.curdir) as entries:
+            matches = [
+                entry
+                for entry in entries
+                if fnmatchcase(entry.name, pattern)
+                and (hidden or not entry.name.startswith("."))
+                and (not dirs_only or entry_is_dir(entry))
+            ]
+    except OSError:  # pragma: no cover
+        return []
+    return sorted(matches, key=attrgetter("name"))
+
+
+def walk_sorted(dirname: str, *, dirs_only: bool = False) -> Iterator[str]:
+    """Recursively yield every non-hidden path under a directory in order."""
+    for entry in sorted_matches(dirname, "*"):
+        child = path.join(dirname, entry.name)
+        is_dir = entry_is_dir(entry)
+        if is_dir or not dirs_only:
+            yield child
+        if is_dir:
+            yield from walk_sorted(child, dirs_only=dirs_only)
+
+
+def iglob_sorted(pattern: str, *, parents: bool = False) -> Iterator[str]:
+    """Lazily expand a glob pattern into sorted paths.
+
+    Each directory is listed and sorted on its own as it's reached, so the first
+    paths are available without listing every match up front. A `**` component
+    matches any number of nested directories. If `parents` is true, the pattern
+    is the directory part of a longer pattern, so only directories are yielded
+    and `**` also matches no directories at all.
+    """
+    exists = path.isdir if parents else path.lexists
+    if not GLOB_MAGIC.search(pattern):
+        if exists(pattern):
+            yield pattern
+        return
+
+    dirname, basename = path.split(pattern)
+    if GLOB_MAGIC.search(dirname):
+        dirnames = iglob_sorted(dirname, parents=True)
+    elif not dirname or path.isdir(dirname):
+        dirnames = [dirname]
+    else:
+        return
+    for parent in dirnames:
+        if basename == "**":
+            if parent or parents:
+                yield path.join(parent, "")
+            yield from walk_sorted(parent, dirs_only=parents)
+        elif GLOB_MAGIC.search(basename):
+            for entry in sorted_matches(parent, basename, dirs_only=parents):
+                yield path.join(parent, entry.name)
+        elif exists(joined := path.join(parent, basename)):
+            yield joined
+
+
+def expand_sources(
     sources: Sequence[str | Path] | Sequence[BinaryIO] | str | Path | BinaryIO,
     glob: bool,
-) -> Iterator[BinaryIO]:
+) -> Iterator[str | BinaryIO]:
     match sources:
         case [*_]:
             normed = sources
@@ -177,70 +298,590 @@ def open_sources(
             case str() | Path():
                 expanded = path.expanduser(source)
                 # sort for deterministic ordering of files
-                globbed = sorted(libglob.glob(expanded)) if glob else [expanded]
-                for fpath in globbed:
-                    with open(fpath, "rb") as fo:
-                        yield fo
+                if glob:
+                    yield from iglob_sorted(expanded)
+                else:
+                    yield expanded
             case _:
                 yield source
 
 
+def open_reader(
+    source: str | BinaryIO, *, io_buffer_size: int
+) -> tuple[fastavro.block_reader, ExitStack]:
+    """Open a source and read its header.
+
+    The returned stack owns any file that was opened and must be closed once
+    the reader is exhausted. Regular files are memory mapped so reads come
+    straight from the page cache, other files are opened with a buffer of
+    `io_buffer_size` bytes so reading a block takes few syscalls.
+    """
+    with ExitStack() as stack:
+        match source:
+            case str():
+                raw = stack.enter_context(open(source, "rb", buffering=0))
+                stats = os.fstat(raw.fileno())
+                fo = None
+                # empty files can't be mapped, and some filesystems don't
+                # support it, in which case a buffered file is fine
+                if stat.S_ISREG(stats.st_mode) and stats.st_size:
+                    with suppress(OSError):
+                        fo = stack.enter_context(
+                            mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+                        )
+                if fo is None:
+                    fo = stack.enter_context(BufferedReader(raw, io_buffer_size))
+            case _:
+                fo = source
+        reader = fastavro.block_reader(fo)  # pyright: ignore[reportArgumentType]
+        return reader, stack.pop_all()
+
+
+def header_schema(reader: fastavro.block_reader) -> str:
+    """Get the raw writer schema json from a reader's header."""
+    return reader.metadata["avro.schema"]  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+
+
+def prefetch_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    num_ahead: int,
+    executor: Executor,
+    discard: Callable[[R], None] | None = None,
+) -> Generator[R, None, None]:
+    """Map `func` over `items` on an executor, yielding results in order.
+
+    At most `num_ahead` items are submitted ahead of the consumer. If the
+    consumer stops early, outstanding work is cancelled and any results that
+    already finished are passed to `discard`. The executor is shut down once
+    iteration finishes, but work that already started is only waited on if its
+    results need to be discarded.
+    """
+    pending: deque[Future[R]] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) > num_ahead:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            if not fut.cancel() and discard is not None and fut.exception() is None:
+                discard(fut.result())
+        executor.shutdown(wait=discard is not None, cancel_futures=True)
+
+
+def iter_in_thread(items: Iterable[R], *, maxsize: int) -> Generator[R, None, None]:
+    """Iterate `items` on a background thread, buffering up to `maxsize` results.
+
+    Exceptions raised while iterating are re-raised in the consumer, including
+    ones that don't derive from `Exception`, like polars panics, so the
+    consumer never waits on a producer that died.
+    """
+    results: Queue[tuple[R] | BaseException | None] = Queue(maxsize)
+    stop = Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                results.put((item,))
+                if stop.is_set():
+                    return
+        except BaseException as ex:  # noqa: BLE001
+            results.put(ex)
+        else:
+            results.put(None)
+
+    thread = Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while (res := results.get()) is not None:
+            if isinstance(res, BaseException):
+                raise res
+            yield res[0]
+    finally:
+        stop.set()
+        # drain so a producer blocked on a full queue sees that we stopped
+        while thread.is_alive():
+            with suppress(Empty):
+                results.get(timeout=0.01)
+        thread.join()
+
+
 def iter_readers(
     sources: Sequence[str | Path] | Sequence[BinaryIO] | str | Path | BinaryIO,
     *,
     glob: bool,
     parse_logical_types: bool,
     single_col_name: str | None,
-) -> tuple[pl.Schema, bool, Iterator[Iterable[object]]]:
-    source_iter = open_sources(sources, glob)
+    io_buffer_size: int,
+) -> tuple[pl.Schema, bool, Generator[fastavro.block_reader, None, None], ExitStack]:
+    """Open sources and read the schema from the first one.
+
+    The returned stack owns the readers, and closing it closes every file they
+    opened, even if the readers were never iterated.
+    """
+    source_iter = expand_sources(sources, glob)
     if (first := next(source_iter, None)) is None:
         raise ValueError("sources were empty")
 
-    reader = fastavro.reader(first)
+    reader, first_stack = open_reader(first, io_buffer_size=io_buffer_size)
     schema, singleton = parse_schema(
         reader.writer_schema,
         parse_logical_types=parse_logical_types,
         single_col_name=single_col_name,
     )
 
-    def rest() -> Iterator[Iterable[object]]:
-        yield reader
-        for i, fo in enumerate(source_iter, 1):
-            next_reader = fastavro.reader(fo)
-            new_schema, new_single = parse_schema(
-                next_reader.writer_schema,
-                parse_logical_types=parse_logical_types,
-                single_col_name=single_col_name,
-            )
-            if new_schema == schema and singleton == new_single:
-                yield next_reader
-            else:
-                raise RuntimeError(
-                    f"schema of source {i:d} didn't match schema of source 0\n{next_reader.writer_schema} != {schema}"
+    def rest() -> Generator[fastavro.block_reader, None, None]:
+        with first_stack:
+            yield reader
+        concurrent = env_int("POLARS_FASTAVRO_CONCURRENT_READERS", os.cpu_count() or 1)
+        pre_init = env_int("POLARS_FASTAVRO_NUM_READERS_PRE_INIT", concurrent + 3)
+        opened = prefetch_map(
+            partial(open_reader, io_buffer_size=io_buffer_size),
+            source_iter,
+            num_ahead=pre_init,
+            executor=ThreadPoolExecutor(concurrent),
+            discard=lambda opened: opened[1].close(),
+        )
+        # multi-file scans almost always share a writer schema, so only parse
+        # each distinct one, keyed by the raw schema json from the file header
+        matching = {header_schema(reader)}
+        first_writer_schema = reader.writer_schema
+        for i, (next_reader, stack) in enumerate(opened, 1):
+            with stack:
+                raw_schema = header_schema(next_reader)
+                if raw_schema in matching:
+                    yield next_reader
+                    continue
+                # the same schema serialized differently still compares equal
+                # as parsed avro, which is cheaper than converting it
+                if next_reader.writer_schema == first_writer_schema:
+                    matching.add(raw_schema)
+                    yield next_reader
+                    continue
+                new_schema, new_single = parse_schema(
+                    next_reader.writer_schema,
+                    parse_logical_types=parse_logical_types,
+                    single_col_name=single_col_name,
                 )
+                if new_schema == schema and singleton == new_single:
+                    matching.add(raw_schema)
+                    yield next_reader
+                else:
+                    raise RuntimeError(
+                        f"schema of source {i:d} didn't match schema of source 0\n{next_reader.writer_schema} != {schema}"
+                    )
 
-    return schema, singleton, rest()
+    readers = rest()
+    # closing a generator that never started doesn't run its body, so the
+    # first file is closed separately
+    owner = ExitStack()
+    owner.push(first_stack)
+    owner.callback(readers.close)
+    # polars doesn't always read a scan, so readers can be dropped unused
+    weakref.finalize(owner, first_stack.close)
+    return schema, singleton, readers, owner
 
 
-def chunk(it: Iterable[R], chunk_size: int) -> Iterator[list[R]]:
-    assert chunk_size > 0
-    chunk: list[R] = []
-    for val in it:
-        chunk.append(val)
-        if len(chunk) == chunk_size:
-            yield chunk
-            chunk = []
-    if chunk:
-        yield chunk
+def iter_records(readers: Iterable[Iterable[Iterable[object]]]) -> Iterator[Any]:
+    """Yield the records in each block of each reader."""
+    for reader in readers:
+        for block in reader:
+            yield from block
+
+
+def read_file_ipc(  # noqa: PLR0913
+    source: tuple[int, str],
+    *,
+    schema: pl.Schema,
+    singleton: bool,
+    projected: pl.Schema,
+    predicate: pl.Expr | None,
+    n_rows: int | None,
+    parse_logical_types: bool,
+    single_col_name: str | None,
+    batch_size: int,
+    io_buffer_size: int,
+) -> bytes:
+    """Read the matching rows of a file into arrow ipc bytes.
 
+    This runs in a worker process, so the file is checked against the scan's
+    schema here. Decoding stops once `n_rows` rows match.
+    """
+    i, fpath = source
+    reader, stack = open_reader(fpath, io_buffer_size=io_buffer_size)
+    with stack:
+        new_schema, new_single = parse_schema(
+            reader.writer_schema,
+            parse_logical_types=parse_logical_types,
+            single_col_name=single_col_name,
+        )
+        if new_schema != schema or new_single != singleton:
+            raise RuntimeError(
+                f"schema of source {i:d} didn't match schema of source 0\n{reader.writer_schema} != {schema}"
+            )
+        records = (rec for block in reader for rec in block)  # pyright: ignore[reportUnknownVariableType]
+        frames = [
+            *build_frames(
+                records,  # pyright: ignore[reportUnknownArgumentType]
+                schema=schema,
+                singleton=singleton,
+                projected=projected,
+                predicate=predicate,
+                n_rows=n_rows,
+                batch_size=batch_size,
+            )
+        ]
+    frame = pl.concat(frames) if frames else pl.DataFrame(schema=projected)
+    buff = BytesIO()
+    frame.write_ipc(buff)
+    return buff.getvalue()
+
+
+def iter_file_frames(  # noqa: PLR0913
+    fpaths: Iterable[str],
+    *,
+    workers: int,
+    schema: pl.Schema,
+    singleton: bool,
+    projected: pl.Schema,
+    predicate: pl.Expr | None,
+    n_rows: int | None,
+    parse_logical_types: bool,
+    single_col_name: str | None,
+    batch_size: int,
+    io_buffer_size: int,
+) -> Generator[pl.DataFrame, None, None]:
+    """Read files in worker processes, yielding a filtered frame per file in order.
+
+    Decoding is bound by creating python objects, so processes are the only way
+    to use more than one core. Frames are sent back as arrow ipc, which is
+    cheap to serialize and read.
+    """
+    read = partial(
+        read_file_ipc,
+        schema=schema,
+        singleton=singleton,
+        projected=projected,
+        predicate=predicate,
+        n_rows=n_rows,
+        parse_logical_types=parse_logical_types,
+        single_col_name=single_col_name,
+        batch_size=batch_size,
+        io_buffer_size=io_buffer_size,
+    )
+    # polars is multi-threaded, so forking isn't safe
+    pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+    results = prefetch_map(read, enumerate(fpaths), num_ahead=workers, executor=pool)
+    with closing(results):
+        for data in results:
+            yield pl.read_ipc(data)
+
+
+def iter_record_frames(  # noqa: PLR0913
+    readers: Iterable[fastavro.block_reader],
+    *,
+    schema: pl.Schema,
+    singleton: bool,
+    projected: pl.Schema,
+    predicate: pl.Expr | None,
+    n_rows: int | None,
+    batch_size: int,
+) -> Generator[pl.DataFrame, None, None]:
+    """Read sources in this process, yielding filtered frames in order.
 
-def scan_avro(
+    Frames are built on a separate thread so they overlap with polars
+    processing the previous one.
+    """
+    records = iter_records(readers)
+    frames = iter_in_thread(
+        build_frames(
+            records,
+            schema=schema,
+            singleton=singleton,
+            projected=projected,
+            predicate=predicate,
+            n_rows=n_rows,
+            batch_size=batch_size,
+        ),
+        maxsize=2,
+    )
+    # close eagerly so the producer thread stops before the readers are closed
+    with closing(frames):
+        yield from frames
+
+
+def multiple_paths(
+    sources: Sequence[str | Path] | Sequence[BinaryIO] | str | Path | BinaryIO,
+    glob: bool,
+) -> Iterator[str] | None:
+    """Lazily expand sources if they're at least two paths, otherwise None."""
+    expanded = expand_sources(sources, glob)
+    first = [*islice(expanded, 2)]
+    match first:
+        case [str(), str()]:
+            return chain(first, expanded)  # pyright: ignore[reportReturnType]
+        case _:
+            return None
+
+
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "Eq": operator.eq,
+    "NotEq": operator.ne,
+    "Lt": operator.lt,
+    "LtEq": operator.le,
+    "Gt": operator.gt,
+    "GtEq": operator.ge,
+}
+
+FLIPPED = {
+    "Eq": "Eq",
+    "NotEq": "NotEq",
+    "Lt": "Gt",
+    "LtEq": "GtEq",
+    "Gt": "Lt",
+    "GtEq": "LtEq",
+}
+
+INT_LITERALS = {
+    "Int8",
+    "Int16",
+    "Int32",
+    "Int64",
+    "UInt8",
+    "UInt16",
+    "UInt32",
+    "UInt64",
+}
+
+
+def literal_value(node: Any) -> int | str | None:
+    """Get the value of a serialized int or string literal."""
+    match node:
+        case {"Literal": {"Dyn": {"Int": int() as val}}}:
+            return val
+        case {"Literal": {"Scalar": {"String": str() as val}}}:
+            return val
+        case {"Literal": {"Scalar": {**scalar}}} if len(scalar) == 1:  # pyright: ignore[reportUnknownVariableType]
+            [(kind, val)] = scalar.items()  # pyright: ignore[reportUnknownVariableType, reportUnknownMemberType]
+            if kind in INT_LITERALS and type(val) is int:  # pyright: ignore[reportUnknownArgumentType]
+                return val
+            return None
+        case _:
+            return None
+
+
+def compare_filter(
+    name: str, op: str, node: Any, schema: pl.Schema, singleton: bool
+) -> Callable[[Any], bool] | None:
+    """Create a record filter comparing a column to a literal."""
+    dtype = schema.get(name)
+    match literal_value(node):
+        case int() as lit if dtype is not None and dtype.is_integer():
+            pass
+        case str() as lit if dtype == pl.String:
+            pass
+        case _:
+            return None
+    compare = COMPARISONS[op]
+
+    # like polars, comparisons with nulls never keep the row
+    def keep(rec: Any) -> bool:
+        val = rec if singleton else rec[name]
+        return val is not None and compare(val, lit)
+
+    return keep
+
+
+def record_filter(
+    node: Any, schema: pl.Schema, singleton: bool
+) -> Callable[[Any], bool] | None:
+    """Convert a serialized expression into a filter on avro records."""
+    match node:
+        case {"BinaryExpr": {"left": left, "op": "And", "right": right}}:
+            # keeping only rows that one side accepts is still conservative
+            left_filter = record_filter(left, schema, singleton)
+            right_filter = record_filter(right, schema, singleton)
+            if left_filter is None or right_filter is None:
+                return left_filter or right_filter
+            return lambda rec: left_filter(rec) and right_filter(rec)
+        case {
+            "BinaryExpr": {
+                "left": {"Column": str() as name},
+                "op": str() as op,
+                "right": lit,
+            }
+        } if op in COMPARISONS:
+            return compare_filter(name, op, lit, schema, singleton)
+        case {
+            "BinaryExpr": {
+                "left": lit,
+                "op": str() as op,
+                "right": {"Column": str() as name},
+            }
+        } if op in FLIPPED:
+            return compare_filter(name, FLIPPED[op], lit, schema, singleton)
+        case _:
+            return None
+
+
+def predicate_filter(
+    predicate: pl.Expr, schema: pl.Schema, *, singleton: bool
+) -> Callable[[Any], bool] | None:
+    """Try to evaluate simple parts of a predicate on avro records.
+
+    Only comparisons between int or string columns and literals, possibly joined
+    with `&`, are handled. The returned filter never drops a row that
+    `predicate` would keep, but may keep rows it drops, so `predicate` still
+    needs to be applied afterwards. The expression's serialized form isn't
+    stable across polars versions, so anything unrecognized returns None.
+    """
+    try:
+        tree = json.loads(predicate.meta.serialize(format="json"))
+    except Exception:  # noqa: BLE001  # pragma: no cover
+        return None
+    return record_filter(tree, schema, singleton)
+
+
+def null_frame(height: int) -> pl.DataFrame:
+    """Create a frame with no columns but `height` rows."""
+    try:
+        return pl.DataFrame(height=height)
+    except TypeError:  # pragma: no cover
+        # older polars can't give frames without columns a height, but they
+        # also never ask the plugin for no columns
+        nulls = pl.Series("", [], pl.Null).extend_constant(None, height)  # pyright: ignore[reportUnknownMemberType]
+        return nulls.to_frame().drop("")
+
+
+def block_heights(
+    readers: Iterable[fastavro.block_reader], n_rows: int | None
+) -> Iterator[int]:
+    """Yield the number of records in each block, up to `n_rows` in total."""
+    for reader in readers:
+        for block in reader:
+            height: int = block.num_records  # pyright: ignore[reportUnknownMemberType]
+            if n_rows is not None:
+                if n_rows == 0:
+                    return
+                height = min(height, n_rows)
+                n_rows -= height
+            yield height
+
+
+def build_series(name: str, values: list[object], dtype: pl.DataType) -> pl.Series:
+    """Create a series from the python values of a column."""
+    match dtype:
+        case pl.Datetime(time_unit="ms" | "us" as unit, time_zone=str() as zone):
+            # fastavro decodes these as aware datetimes, which polars converts
+            # several times slower than naive ones, so strip the zone and
+            # reattach it once the column is built
+            naive = [
+                val.replace(tzinfo=None) if isinstance(val, datetime) else val
+                for val in values
+            ]
+            series = pl.Series(name, naive, pl.Datetime(unit))
+            return series.dt.replace_time_zone(zone)
+        case _:
+            return pl.Series(name, values, dtype)
+
+
+def columns_frame(
+    schema: pl.Schema, cols: Sequence[list[object]], height: int
+) -> pl.DataFrame:
+    """Create a frame from python lists of column values."""
+    if not cols:  # pragma: no cover
+        # empty projections are counted from block headers instead
+        return null_frame(height)
+    # columns are built natively by polars, so the frame wraps them without any
+    # arrow conversion or copy
+    return pl.DataFrame(
+        [
+            build_series(name, col, dtype)
+            for (name, dtype), col in zip(schema.items(), cols, strict=True)
+        ]
+    )
+
+
+def iter_batches(
+    records: Iterable[Any],
+    schema: pl.Schema,
+    batch_size: int,
+    *,
+    singleton: bool,
+) -> Iterator[pl.DataFrame]:
+    """Build frames of up to `batch_size` rows column-by-column from records.
+
+    Each column is pulled out of a batch with `map` and `operator.itemgetter`,
+    so the per-record loop runs in C instead of python bytecode, and polars
+    never has to re-traverse the record dicts. For singleton schemas the
+    records are already the values of the only column, so a batch is used as
+    is.
+    """
+    assert batch_size > 0
+    getters = [itemgetter(name) for name in schema.names()]
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        if singleton:
+            cols = [batch] if getters else []
+        else:
+            cols = [list(map(getter, batch)) for getter in getters]
+        yield columns_frame(schema, cols, len(batch))
+
+
+def build_frames(  # noqa: PLR0913
+    records: Iterable[Any],
+    *,
+    schema: pl.Schema,
+    singleton: bool,
+    projected: pl.Schema,
+    predicate: pl.Expr | None,
+    n_rows: int | None,
+    batch_size: int,
+) -> Iterator[pl.DataFrame]:
+    """Build frames of the records that match `predicate`, up to `n_rows` rows."""
+    # drop records before they're converted if we can
+    if predicate is not None and (
+        keep := predicate_filter(predicate, schema, singleton=singleton)
+    ):
+        records = filter(keep, records)
+    # without a predicate every record is kept, so stop decoding at n_rows
+    if predicate is None and n_rows is not None:
+        records = islice(records, n_rows)
+    batches = iter_batches(records, projected, batch_size, singleton=singleton)
+    return limit_frames(batches, predicate, n_rows)
+
+
+def limit_frames(
+    batches: Iterable[pl.DataFrame], predicate: pl.Expr | None, n_rows: int | None
+) -> Iterator[pl.DataFrame]:
+    """Filter batches, stopping once `n_rows` rows were yielded."""
+    for batch in batches:
+        # filtering eagerly skips planning a lazy query for every batch
+        if predicate is None:
+            frame = batch
+        else:
+            frame = batch.filter(predicate)  # pyright: ignore[reportUnknownMemberType]
+        if n_rows is not None:
+            frame = frame[:n_rows]
+            n_rows -= len(frame)
+        yield frame
+        if n_rows == 0:
+            return
+
+
+def scan_avro(  # noqa: PLR0913
     sources: Sequence[str | Path] | Sequence[BinaryIO] | str | Path | BinaryIO,
     *,
     convert_logical_types: bool = False,
     batch_size: int = 32768,
     glob: bool = True,
     single_col_name: str | None = None,
+    workers: int | None = None,
+    io_buffer_size: int = 1 << 20,
 ) -> pl.LazyFrame:
     """Scan Avro files.
 
@@ -251,15 +892,26 @@ def scan_avro(
         backed by physical types that can will be parsed as those physical types
         instead.
     batch_size : How many rows to attempt to read at a time.
-    glob : If true, expand path sources with glob patterns.
+    glob : If true, expand path sources with glob patterns, where `**` matches
+        any number of directories.
     single_col_name : If not None and the avro schema isn't a record, wrap
         values in a record with a single field called `single_col_name`.
+    workers : If greater than one and the sources are multiple files, decode
+        whole files in this many worker processes. Workers are started with
+        spawn, so scripts that use this need an `if __name__ == "__main__":`
+        guard.
+    io_buffer_size : The size in bytes of the read buffer for file sources that
+        can't be memory mapped.
     """
+    if io_buffer_size < 1:
+        raise ValueError(f"io_buffer_size must be positive, but got {io_buffer_size:d}")
     def_batch_size = batch_size
 
     schema: pl.Schema | None = None
     singleton: bool | None = None
-    opened_readers: Iterator[Iterable[object]] | None = None
+    opened_readers: (
+        tuple[Generator[fastavro.block_reader, None, None], ExitStack] | None
+    ) = None
 
     def get_schema() -> pl.Schema:
         nonlocal schema, singleton, opened_readers
@@ -270,15 +922,33 @@ def scan_avro(
                 "internal error: schema not set but readers is"
             )
         else:
-            schema, singleton, readers = iter_readers(
+            schema, singleton, readers, owner = iter_readers(
                 sources,
                 glob=glob,
                 parse_logical_types=convert_logical_types,
                 single_col_name=single_col_name,
+                io_buffer_size=io_buffer_size,
             )
-            opened_readers = readers
+            opened_readers = readers, owner
             return schema
 
+    def take_readers() -> tuple[
+        Generator[fastavro.block_reader, None, None], ExitStack
+    ]:
+        nonlocal opened_readers
+        if opened_readers is None:
+            _, _, readers, owner = iter_readers(
+                sources,
+                glob=glob,
+                parse_logical_types=convert_logical_types,
+                single_col_name=single_col_name,
+                io_buffer_size=io_buffer_size,
+            )
+            return readers, owner
+        taken = opened_readers
+        opened_readers = None
+        return taken
+
     def source_generator(
         with_columns: list[str] | None,
         predicate: pl.Expr | None,
@@ -289,38 +959,60 @@ def scan_avro(
             raise RuntimeError(
                 "internal error: schema not defined when it needed to be"
             )
-        nonlocal opened_readers
-        if opened_readers is None:
-            _, _, readers = iter_readers(
-                sources,
-                glob=glob,
+
+        # nothing to decode when only the number of rows is needed, which block
+        # headers already have
+        if with_columns == [] and predicate is None:
+            readers, owner = take_readers()
+            with owner:
+                for height in block_heights(readers, n_rows):
+                    yield null_frame(height)
+            return
+
+        # project before building columns so unselected fields are never copied
+        if with_columns is None:
+            projected = schema
+        else:
+            projected = pl.Schema([(name, schema[name]) for name in with_columns])
+
+        # the readers' owner is closed last, after the frames that read them
+        owner = ExitStack()
+        if (
+            workers is not None
+            and workers > 1
+            and (fpaths := multiple_paths(sources, glob)) is not None
+        ):
+            # paths are streamed to the workers, so readers aren't needed
+            if opened_readers is not None:
+                _, unused = take_readers()
+                unused.close()
+            frames = iter_file_frames(
+                fpaths,
+                workers=workers,
+                schema=schema,
+                singleton=singleton,
+                projected=projected,
+                predicate=predicate,
+                n_rows=n_rows,
                 parse_logical_types=convert_logical_types,
                 single_col_name=single_col_name,
+                batch_size=batch_size or def_batch_size,
+                io_buffer_size=io_buffer_size,
             )
         else:
-            readers = opened_readers
-            opened_readers = None
-
-        # if we parsed a singleton schema, then wrap to make them records
-        records = (rec for reader in readers for rec in reader)
-        if singleton:
-            records = ({single_col_name: rec} for rec in records)
-
-        for batch in chunk(records, batch_size or def_batch_size):
-            lazy = pl.from_dicts(batch, schema).lazy()  # pyright: ignore[reportArgumentType]
-            if with_columns is not None:
-                lazy = lazy.select(with_columns)  # pyright: ignore[reportUnknownMemberType]
-            if predicate is not None:
-                lazy = lazy.filter(predicate)  # pyright: ignore[reportUnknownMemberType]
-            frame = lazy.collect()
-            if n_rows is None:
-                yield frame
-            else:
-                frame = frame[:n_rows]
-                n_rows -= len(frame)
-                yield frame
-                if n_rows == 0:
-                    break
+            readers, owner = take_readers()
+            frames = iter_record_frames(
+                readers,
+                schema=schema,
+                singleton=singleton,
+                projected=projected,
+                predicate=predicate,
+                n_rows=n_rows,
+                batch_size=batch_size or def_batch_size,
+            )
+        # frames are already filtered, but each source is limited on its own
+        with owner, closing(frames):
+            yield from limit_frames(frames, None, n_rows)
 
     try:
         return register_io_source(source_generator, schema=get_schema)
@@ -341,6 +1033,8 @@ def read_avro(  # noqa: PLR0913
     batch_size: int = 32768,
     glob: bool = True,
     single_col_name: str | None = None,
+    workers: int | None = None,
+    io_buffer_size: int = 1 << 20,
 ) -> pl.DataFrame:
     """Read an avro file.
 
@@ -359,6 +1053,12 @@ def read_avro(  # noqa: PLR0913
     glob : Whether to interpret glob patterns in files.
     single_col_name : If not None and the avro schema isn't a record, wrap
         values in a record with a single field called `single_col_name`.
+    workers : If greater than one and the sources are multiple files, decode
+        whole files in this many worker processes. Workers are started with
+        spawn, so scripts that use this need an `if __name__ == "__main__":`
+        guard.
+    io_buffer_size : The size in bytes of the read buffer for file sources that
+        can't be memory mapped.
     """
     lazy = scan_avro(
         sources,
@@ -366,6 +1066,8 @@ def read_avro(  # noqa: PLR0913
         glob=glob,
         convert_logical_types=convert_logical_types,
         single_col_name=single_col_name,
+        workers=workers,
+        io_buffer_size=io_buffer_size,
     )
     if columns is not None:
         lazy = lazy.select(  # pyright: ignore[reportUnknownMemberType]
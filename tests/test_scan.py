@@ -1,8 +1,15 @@
 """Test scan functionality."""
 
+import gc
+import mmap
+import os
+import threading
+from collections.abc import Iterator
 from datetime import time
 from decimal import Decimal
+from functools import partial
 from io import BytesIO
+from pathlib import Path
 from uuid import UUID
 
 import fastavro
@@ -11,6 +18,12 @@ import pytest
 from polars.testing import assert_frame_equal
 
 from polars_fastavro import read_avro, scan_avro, write_avro
+from polars_fastavro._scan import (
+    iter_in_thread,
+    iter_readers,
+    predicate_filter,
+    read_file_ipc,
+)
 
 
 def test_scan_avro() -> None:
@@ -50,6 +63,15 @@ def test_projection_pushdown_avro() -> None:
     assert_frame_equal(normal, unoptimized)
 
 
+def test_projection_order() -> None:
+    """Test that projected columns are returned in the selected order."""
+    lazy = scan_avro("resources/food.avro").select("sugars_g", "category")  # pyright: ignore[reportUnknownMemberType]
+    frame = lazy.collect()
+    reference = read_avro("resources/food.avro", columns=["sugars_g", "category"])
+    assert_frame_equal(frame, reference)
+    assert frame.columns == ["sugars_g", "category"]
+
+
 def test_predicate_pushdown_avro() -> None:
     """Test that predicate is pushed down to scan."""
     file_path = "resources/food.avro"
@@ -83,6 +105,123 @@ def test_glob_n_rows() -> None:
     }
 
 
+def test_nested_glob(tmp_path: Path) -> None:
+    """Test that globs match across directories in sorted order."""
+    for i, name in enumerate(["b/x.avro", "a/y.avro", "a/c/z.avro", ".h/w.avro"]):
+        dest = tmp_path / name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        write_avro(pl.from_dict({"x": [i]}), dest)
+
+    frame = scan_avro(tmp_path / "*" / "*.avro").collect()
+    assert frame["x"].to_list() == [1, 0]
+
+    frame = scan_avro(tmp_path / "**" / "*.avro").collect()
+    assert frame["x"].to_list() == [1, 2, 0]
+
+    frame = scan_avro(tmp_path / "*" / "x.avro").collect()
+    assert frame["x"].to_list() == [0]
+
+    lazy = scan_avro(tmp_path / "missing" / "*.avro")
+    with pytest.raises(Exception, match="sources were empty"):
+        lazy.collect()
+
+
+def test_glob_lists_only_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that expanding directory wildcards never lists files."""
+    for name in ["x.avro", "a/y.avro", "a/b/z.avro"]:
+        dest = tmp_path / name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        write_avro(pl.from_dict({"x": [0]}), dest)
+
+    scandir = os.scandir
+    listed: list[str] = []
+
+    def spy(dirname: str) -> Iterator[os.DirEntry[str]]:
+        listed.append(dirname)
+        return scandir(dirname)
+
+    monkeypatch.setattr(os, "scandir", spy)
+    frame = scan_avro(tmp_path / "**" / "*.avro").collect()
+    assert len(frame) == 3  # noqa: PLR2004
+    assert listed
+    assert all(Path(dirname).is_dir() for dirname in listed)
+
+
+def test_workers(tmp_path: Path) -> None:
+    """Test that files can be read in worker processes."""
+    for i in range(3):
+        write_avro(pl.from_dict({"x": [i, i], "y": ["a", "b"]}), tmp_path / f"{i}.avro")
+    write_avro(pl.from_dict({"z": [1.0]}), tmp_path / "other.avro")
+
+    frame = read_avro(tmp_path / "[0-9].avro", workers=2)
+    expected = read_avro(tmp_path / "[0-9].avro")
+    assert_frame_equal(frame, expected)
+    assert frame["x"].to_list() == [0, 0, 1, 1, 2, 2]
+
+    frame = read_avro(tmp_path / "[0-9].avro", columns=["y"], n_rows=3, workers=2)
+    assert frame["y"].to_list() == ["a", "b", "a"]
+
+    frame = (
+        scan_avro(tmp_path / "[0-9].avro", workers=2)
+        .filter(pl.col("y") == "b")  # type: ignore
+        .collect()
+    )
+    assert frame["x"].to_list() == [0, 1, 2]
+
+    with pytest.raises(
+        Exception, match="schema of source 3 didn't match schema of source 0"
+    ):
+        read_avro(tmp_path / "*.avro", workers=2)
+
+    # a single file or buffers are read in this process
+    expected = read_avro("resources/food.avro")
+    frame = read_avro("resources/food.avro", workers=2)
+    assert_frame_equal(frame, expected)
+
+    buff = BytesIO()
+    write_avro(expected, buff)
+    buff.seek(0)
+    frame = read_avro([buff], workers=2)
+    assert_frame_equal(frame, expected)
+
+
+def test_read_file_ipc(tmp_path: Path) -> None:
+    """Test that worker processes read the matching rows of a file."""
+    dest = tmp_path / "0.avro"
+    write_avro(pl.from_dict({"x": [0, 1, 2, 3], "y": ["a", "b", "a", "b"]}), dest)
+    schema = pl.Schema({"x": pl.Int64, "y": pl.String})
+    read = partial(
+        read_file_ipc,
+        schema=schema,
+        singleton=False,
+        projected=pl.Schema({"x": pl.Int64}),
+        parse_logical_types=False,
+        single_col_name=None,
+        batch_size=2,
+        io_buffer_size=1 << 20,
+    )
+
+    frame = pl.read_ipc(read((0, str(dest)), predicate=None, n_rows=None))
+    assert frame["x"].to_list() == [0, 1, 2, 3]
+
+    frame = pl.read_ipc(read((0, str(dest)), predicate=None, n_rows=3))
+    assert frame["x"].to_list() == [0, 1, 2]
+
+    predicate = pl.col("x") > 1
+    frame = pl.read_ipc(read((0, str(dest)), predicate=predicate, n_rows=None))
+    assert frame.schema == pl.Schema({"x": pl.Int64})
+    assert frame["x"].to_list() == [2, 3]
+
+    frame = pl.read_ipc(read((0, str(dest)), predicate=predicate, n_rows=1))
+    assert frame["x"].to_list() == [2]
+
+    write_avro(pl.from_dict({"z": [1.0]}), other := tmp_path / "1.avro")
+    with pytest.raises(
+        RuntimeError, match="schema of source 1 didn't match schema of source 0"
+    ):
+        read((1, str(other)), predicate=None, n_rows=None)
+
+
 def test_many_files() -> None:
     """Test that scan works with many files."""
     buff = BytesIO()
@@ -95,6 +234,106 @@ def test_many_files() -> None:
     assert_frame_equal(res, reference)
 
 
+def test_reader_pre_init(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that readers opened ahead of time stay in order."""
+    monkeypatch.setenv("POLARS_FASTAVRO_CONCURRENT_READERS", "3")
+    monkeypatch.setenv("POLARS_FASTAVRO_NUM_READERS_PRE_INIT", "5")
+    buffs: list[BytesIO] = []
+    for i in range(20):
+        buff = BytesIO()
+        write_avro(pl.from_dict({"x": [i]}), buff)
+        buff.seek(0)
+        buffs.append(buff)
+    res = scan_avro(buffs).collect()
+    assert res["x"].to_list() == [*range(20)]
+
+    for buff in buffs:
+        buff.seek(0)
+    res = scan_avro(buffs).head(2).collect()
+    assert res["x"].to_list() == [0, 1]
+
+
+def test_invalid_reader_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that invalid reader settings raise."""
+    monkeypatch.setenv("POLARS_FASTAVRO_CONCURRENT_READERS", "0")
+    with pytest.raises(Exception, match="must be positive"):
+        scan_avro(["resources/food.avro", "resources/grains.avro"]).collect()
+
+
+@pytest.mark.filterwarnings("error::ResourceWarning")
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_close_unread_readers() -> None:
+    """Test that readers that were never iterated still close the first file."""
+    _, _, _, owner = iter_readers(
+        ["resources/food.avro", "resources/grains.avro"],
+        glob=False,
+        parse_logical_types=False,
+        single_col_name=None,
+        io_buffer_size=1 << 20,
+    )
+    owner.close()
+    gc.collect()
+
+
+class ProducerPanic(BaseException):
+    """An error that doesn't derive from Exception, like a polars panic."""
+
+
+def test_thread_base_exception() -> None:
+    """Test that errors not deriving from Exception reach the consumer."""
+
+    def items() -> Iterator[int]:
+        yield 0
+        raise ProducerPanic
+
+    results = iter_in_thread(items(), maxsize=1)
+    assert next(results) == 0
+    with pytest.raises(ProducerPanic):
+        next(results)
+
+
+def test_thread_stops_early() -> None:
+    """Test that closing early stops the producer without draining it."""
+    produced: list[int] = []
+
+    def items() -> Iterator[int]:
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    before = threading.active_count()
+    results = iter_in_thread(items(), maxsize=1)
+    assert next(results) == 0
+    results.close()
+    assert threading.active_count() == before
+    assert len(produced) < 10  # noqa: PLR2004
+
+
+def test_scan_no_columns() -> None:
+    """Test that row counts are right when no columns are needed."""
+    lazy = (
+        scan_avro(["resources/food.avro", "resources/grains.avro"])
+        .with_row_index()
+        .select("index")  # pyright: ignore[reportUnknownMemberType]
+    )
+    frame = lazy.collect()
+    assert frame["index"].to_list() == [*range(30)]
+
+    frame = lazy.head(28).collect()
+    assert frame["index"].to_list() == [*range(28)]
+
+    # limiting before the row index pushes n_rows down to the block counts
+    for n_rows in [7, 29]:
+        frame = (
+            scan_avro(["resources/food.avro", "resources/grains.avro"])
+            .head(n_rows)
+            .with_row_index()
+            .select("index")  # pyright: ignore[reportUnknownMemberType]
+            .collect()
+        )
+        assert frame["index"].to_list() == [*range(n_rows)]
+
+
 def test_scan_nrows_empty() -> None:
     """Test that scan doesn't panic with n_rows set to 0."""
     file_path = "resources/food.avro"
@@ -103,6 +342,14 @@ def test_scan_nrows_empty() -> None:
     assert_frame_equal(frame, reference)
 
 
+@pytest.mark.filterwarnings("error::ResourceWarning")
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_unread_scan_closes_files() -> None:
+    """Test that files opened for the schema are closed if polars never reads."""
+    scan_avro("resources/food.avro").head(0).collect()
+    gc.collect()
+
+
 def test_scan_filter_empty() -> None:
     """Test that scan doesn't panic when filter removes all rows."""
     file_path = "resources/food.avro"
@@ -111,6 +358,89 @@ def test_scan_filter_empty() -> None:
     assert_frame_equal(frame, reference)
 
 
+@pytest.mark.parametrize(
+    "predicate",
+    [
+        pl.col("col") == pl.lit(3),
+        pl.col("col") != pl.lit(3),
+        pl.lit(3) <= pl.col("col"),
+        (pl.col("col") > pl.lit(2)) & (pl.col("name") == "b"),
+        (pl.col("col") < pl.lit(4)) & (pl.col("col").cast(pl.String) == "1"),
+        (pl.col("col") < pl.lit(4)) | (pl.col("name") == "a"),
+        pl.col("name") >= "b",
+    ],
+)
+def test_record_filter(predicate: pl.Expr) -> None:
+    """Test that filters evaluated on records match polars."""
+    frame = pl.from_dict(
+        {"col": [0, 1, None, 3, 4, 5], "name": ["a", "b", "b", None, "c", "b"]}
+    )
+    buff = BytesIO()
+    write_avro(frame, buff)
+    buff.seek(0)
+    result = scan_avro(buff, batch_size=2).filter(predicate).collect()  # type: ignore
+    assert_frame_equal(result, frame.filter(predicate))  # type: ignore
+
+
+@pytest.mark.parametrize(
+    ("predicate", "kept"),
+    [
+        (pl.col("col") == pl.lit(3), [3]),
+        (pl.col("col") != pl.lit(3), [0, 1, 4, 5]),
+        (pl.col("col") == pl.lit(3, pl.Int32), [3]),
+        (pl.lit(3) <= pl.col("col"), [3, 4, 5]),
+        (pl.lit(3) > pl.col("col"), [0, 1]),
+        (pl.col("name") >= "b", [1, 2, 3, 5]),
+        ((pl.col("col") > pl.lit(0)) & (pl.col("name") == "b"), [1, 5]),
+        # unsupported sides of an and are left to polars
+        (
+            (pl.col("col") < pl.lit(4)) & (pl.col("col").cast(pl.String) == "1"),
+            [0, 1, 3],
+        ),
+    ],
+)
+def test_predicate_filter(predicate: pl.Expr, kept: list[int]) -> None:
+    """Test that simple predicates are evaluated on records."""
+    schema = pl.Schema({"col": pl.Int64, "name": pl.String})
+    records = [
+        {"col": 0, "name": "a"},
+        {"col": 1, "name": "b"},
+        {"col": None, "name": "c"},
+        {"col": 3, "name": "c"},
+        {"col": 4, "name": None},
+        {"col": 5, "name": "b"},
+    ]
+    keep = predicate_filter(predicate, schema, singleton=False)
+    assert keep is not None
+    assert [i for i, rec in enumerate(records) if keep(rec)] == kept
+
+
+@pytest.mark.parametrize(
+    "predicate",
+    [
+        (pl.col("col") < pl.lit(4)) | (pl.col("name") == "a"),
+        pl.col("col").cast(pl.String) == "1",
+        pl.col("col") == pl.col("other"),
+        pl.col("col") == "1",
+        pl.col("col") == pl.lit(1.5),
+        pl.col("name") == pl.lit(b"x"),
+        pl.col("col").is_in([1, 2]),
+    ],
+)
+def test_predicate_filter_unsupported(predicate: pl.Expr) -> None:
+    """Test that predicates that can't be evaluated on records are left alone."""
+    schema = pl.Schema({"col": pl.Int64, "name": pl.String, "other": pl.Int64})
+    assert predicate_filter(predicate, schema, singleton=False) is None
+
+
+def test_predicate_filter_singleton() -> None:
+    """Test that singleton records are compared directly."""
+    schema = pl.Schema({"col": pl.Int32})
+    keep = predicate_filter(pl.col("col") > pl.lit(3), schema, singleton=True)
+    assert keep is not None
+    assert [val for val in [3, None, 7, 4] if keep(val)] == [7, 4]
+
+
 def test_avro_list_arg() -> None:
     """Test that scan works when passing a list."""
     first = "resources/food.avro"
@@ -185,6 +515,26 @@ def test_large_scan(num: int = 200_000) -> None:
     assert_frame_equal(result, expected)
 
 
+def test_many_blocks(num: int = 50_000) -> None:
+    """Test that records from many blocks are returned in order."""
+    frame = pl.from_dict({"col": [*range(num)]})
+    buff = BytesIO()
+    write_avro(frame, buff)
+    buff.seek(0)
+    result = read_avro(buff, batch_size=1000)
+    assert_frame_equal(result, frame)
+
+
+def test_unusual_names() -> None:
+    """Test that fields with names that aren't identifiers are read."""
+    frame = pl.from_dict({"a b": [1, 2], "'\"\\": ["x", "y"], "0": [True, None]})
+    buff = BytesIO()
+    write_avro(frame, buff)
+    buff.seek(0)
+    result = read_avro(buff)
+    assert_frame_equal(result, frame)
+
+
 def test_read_options() -> None:
     """Test read works with options."""
     frame = read_avro(
@@ -194,6 +544,31 @@ def test_read_options() -> None:
     assert frame["row_index"].to_list() == [*range(11)]
 
 
+def test_io_buffer_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that files are read with a buffer when they can't be mapped."""
+    expected = read_avro("resources/food.avro")
+    # invalid sizes fail even though mapped files don't use a buffer
+    with pytest.raises(ValueError, match="io_buffer_size must be positive"):
+        read_avro("resources/food.avro", io_buffer_size=0)
+
+    def fail(*_: object, **__: object) -> None:
+        raise OSError("can't map")
+
+    monkeypatch.setattr(mmap, "mmap", fail)
+    frame = read_avro("resources/food.avro", io_buffer_size=16)
+    assert_frame_equal(frame, expected)
+    with pytest.raises(ValueError, match="io_buffer_size must be positive"):
+        read_avro("resources/food.avro", io_buffer_size=0)
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    """Test that empty files aren't mapped and fail as invalid avro."""
+    empty = tmp_path / "empty.avro"
+    empty.touch()
+    with pytest.raises(Exception, match="cannot read header"):
+        read_avro(empty)
+
+
 def test_logical_types() -> None:
     """Test that logical types are read as their native polars types."""
     buff = BytesIO()
@@ -482,6 +857,39 @@ def test_mixed_schema_err() -> None:
         lazy.collect()
 
 
+def test_equivalent_schemas() -> None:
+    """Test that sources with different but equivalent schemas can be mixed."""
+    buffs: list[BytesIO] = []
+    for name in ["one", "two", "two"]:
+        buff = BytesIO()
+        fastavro.writer(  # type: ignore
+            buff,
+            {"type": "record", "name": name, "fields": [{"name": "x", "type": "long"}]},
+            [{"x": len(buffs)}],
+        )
+        buff.seek(0)
+        buffs.append(buff)
+    frame = scan_avro(buffs).collect()
+    assert frame["x"].to_list() == [0, 1, 2]
+
+
+def test_reordered_schemas() -> None:
+    """Test that sources whose schema json differs only in key order can be mixed."""
+    fields = [{"name": "x", "type": "long"}]
+    schemas = [
+        {"type": "record", "name": "one", "fields": fields},
+        {"fields": fields, "name": "one", "type": "record"},
+    ]
+    buffs: list[BytesIO] = []
+    for schema in schemas:
+        buff = BytesIO()
+        fastavro.writer(buff, schema, [{"x": len(buffs)}])  # type: ignore
+        buff.seek(0)
+        buffs.append(buff)
+    frame = scan_avro(buffs).collect()
+    assert frame["x"].to_list() == [0, 1]
+
+
 def test_filename_in_err() -> None:
     """Test that invalid filename is reported in error."""
     lazy = scan_avro("does not exist", glob=False)
@@ -525,3 +933,12 @@ def test_non_record_schema() -> None:
     frame = read_avro(buff, single_col_name="col")
     expected = pl.from_dict({"col": [3, 7, 4]}, schema={"col": pl.Int32})
     assert_frame_equal(frame, expected)
+
+    buff.seek(0)
+    frame = (
+        scan_avro(buff, single_col_name="col")
+        .filter(pl.col("col") > pl.lit(3))  # type: ignore
+        .collect()
+    )
+    expected = pl.from_dict({"col": [7, 4]}, schema={"col": pl.Int32})
+    assert_frame_equal(frame, expected)